@@ -1,35 +1,79 @@
+import csv
+import gzip
+import io
+from itertools import repeat
+from operator import attrgetter, itemgetter
+import multiprocessing
 import ProvidenceUtils
 from ProvidenceCorpusReader import ProvidenceCorpusReader
 import os
 
 prov_path = "Providence" # the root directory of the Providence Corpus
-fileids = ProvidenceUtils.getFileIds(prov_path, True)
+csv_dir = 'ProvidenceCSV'
+csv_buffering = 128 * 1024 # write to disk in 128 KiB chunks
+compress_csv = True # write gzip-compressed .csv.gz files instead of plain CSVs
 
-prov = ProvidenceCorpusReader(prov_path, fileids)
+prov = None # the reader shared by every child handled in this process
 
-csv_dir = 'ProvidenceCSV'
 
-for child in fileids.keys():
-    prov = ProvidenceCorpusReader(prov_path, fileids[child])
+def _init_reader(prov_path, all_fileids):
+    """Build the corpus reader once per worker process."""
+    global prov
+    prov = ProvidenceCorpusReader(prov_path, all_fileids)
+
+
+def _open_csv(path):
+    """Open a CSV file for writing, gzip-compressed if compress_csv is set."""
+    if compress_csv:
+        # fast compression level, fed in buffer-sized chunks
+        gz_file = gzip.open(path + '.gz', 'wb', compresslevel=1)
+        return io.TextIOWrapper(io.BufferedWriter(gz_file, buffer_size=csv_buffering),
+                                encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='', buffering=csv_buffering)
+
+
+def _process_child(child, child_fileids, csv_dir):
+    """Parse one child's files and write that child's two CSV files."""
+    child_words = prov.words_info_columns(child_fileids,speaker=["CHI"])
+    mot_words = prov.words_info_columns(child_fileids,speaker=["MOT"])
+
+    with _open_csv(os.path.join(csv_dir, '%s_child.csv' % child)) as child_file, \
+         _open_csv(os.path.join(csv_dir, '%s_parentt.csv' % child)) as parent_file:
+        child_writer = csv.writer(child_file, lineterminator='\n')
+        child_writer.writerow(['child', 'fileid', 'age', 'orthography', 'stem', 'model', 'actual',
+                               'pos', 'start_time', 'end_time'])
+        parent_writer = csv.writer(parent_file, lineterminator='\n')
+        parent_writer.writerow(['child', 'fileid', 'age', 'orthography', 'stem', 'phonemes',
+                                'pos', 'start_time', 'end_time'])
 
-    child_file = open(os.path.join(csv_dir, '%s_child.csv' % child), 'w', encoding='utf-8')
-    child_file.write('child,fileid,age,orthography,stem,model,actual,pos,start_time,end_time\n')
-    parent_file = open(os.path.join(csv_dir, '%s_parentt.csv' % child), 'w',encoding='utf-8')
-    parent_file.write('child,fileid,age,orthography,stem,phonemes,pos,start_time,end_time\n')
+        # format whole columns with map() so no Python-level code runs per row;
+        # media_times is always a (start, end) pair. Ages go through str() so a
+        # missing age is written as 'None', as before, not as an empty field.
+        parent_writer.writerows(zip(repeat(child), mot_words.fileid, map(str, mot_words.age),
+                                    mot_words.orthography, mot_words.stem,
+                                    map('.'.join, mot_words.transcription),
+                                    mot_words.pos,
+                                    map(itemgetter(0), mot_words.media_times),
+                                    map(itemgetter(1), mot_words.media_times)))
 
+        child_writer.writerows(zip(repeat(child), child_words.fileid, map(str, child_words.age),
+                                   child_words.orthography, child_words.stem,
+                                   map('.'.join, map(attrgetter('model'), child_words.transcription)),
+                                   map('.'.join, map(attrgetter('actual'), child_words.transcription)),
+                                   child_words.pos,
+                                   map(itemgetter(0), child_words.media_times),
+                                   map(itemgetter(1), child_words.media_times)))
 
-    child_words = prov.words_info(fileids[child],speaker=["CHI"])
-    mot_words = prov.words_info(fileids[child],speaker=["MOT"])
 
-    for word in mot_words:
-        parent_file.write('%s,%s,%s,%s,%s,%s,%s,%s\n' % (child,word.fileid, word.age, word.orthography, 
-                                                      word.stem, '.'.join(word.transcription), 
-                                                      word.pos, ','.join(str(t) for t in word.media_times)))
-    for word in child_words:
-        child_file.write('%s,%s,%s,%s,%s,%s,%s,%s,%s\n' % (child,word.fileid, word.age,word.orthography, word.stem, 
-                                                        '.'.join(word.transcription.model), 
-                                                        '.'.join(word.transcription.actual), 
-                                                        word.pos, ','.join(str(t) for t in word.media_times)))
+if __name__ == '__main__':
+    fileids = ProvidenceUtils.getFileIds(prov_path, True)
+    all_fileids = sorted(fileid for child_fileids in fileids.values()
+                         for fileid in child_fileids)
 
+    # each child's files and CSVs are independent, so process them in parallel
+    with multiprocessing.Pool(initializer=_init_reader,
+                              initargs=(prov_path, all_fileids)) as pool:
+        pool.starmap(_process_child, [(child, fileids[child], csv_dir)
+                                      for child in fileids])
 
-print('Done.')
+    print('Done.')
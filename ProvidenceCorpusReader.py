@@ -14,6 +14,7 @@ functionalities, including
 
 from __future__ import print_function, division
 
+import logging
 from collections import namedtuple
 
 import nltk
@@ -21,12 +22,57 @@ from nltk.corpus.reader.childes import CHILDESCorpusReader
 from nltk.util import LazyMap, LazyConcatenation
 from six import string_types
 
-import xml.etree.ElementTree as ElementTree
+from lxml import etree
 
 __docformat__ = 'epytext en'
 
+logger = logging.getLogger(__name__)
+
 NS = 'http://www.talkbank.org/ns/talkbank'
 
+# Namespaced tags and compiled search paths, built once instead of on
+# every lookup
+_NSMAP = {'t': NS}
+
+_TAG_U = '{%s}u' % NS
+_TAG_PARTICIPANT = '{%s}participant' % NS
+_TAG_PG = '{%s}pg' % NS
+_TAG_C = '{%s}c' % NS
+_TAG_S = '{%s}s' % NS
+
+# ancestors, nearest first, of the <c>/<s> tags of a suffix (mor/mor-post/mw/pos)
+_SUFFIX_POS_ANCESTORS = tuple('{%s}%s' % (NS, tag) for tag in ('pos', 'mw', 'mor-post', 'mor'))
+
+_XP_W = etree.XPath('.//t:w', namespaces=_NSMAP)
+_XP_PG = etree.XPath('.//t:pg', namespaces=_NSMAP)
+_XP_MEDIA = etree.XPath('.//t:media', namespaces=_NSMAP)
+_XP_REPLACEMENT = etree.XPath('.//t:w/t:replacement', namespaces=_NSMAP)
+_XP_REPLACEMENT_W = etree.XPath('.//t:w/t:replacement/t:w', namespaces=_NSMAP)
+_XP_WK = etree.XPath('.//t:w/t:wk', namespaces=_NSMAP)
+_XP_STEM = etree.XPath('.//t:stem', namespaces=_NSMAP)
+_XP_INFL = etree.XPath('.//t:mor/t:mw/t:mk', namespaces=_NSMAP)
+_XP_SUFFIX_STEM = etree.XPath('.//t:mor/t:mor-post/t:mw/t:stem', namespaces=_NSMAP)
+_XP_GRA = etree.XPath('.//t:mor/t:gra', namespaces=_NSMAP)
+_XP_SUFFIX_GRA = etree.XPath('.//t:mor/t:mor-post/t:gra', namespaces=_NSMAP)
+_XP_ACTUAL_PH = etree.XPath('.//t:actual/t:pw/t:ph', namespaces=_NSMAP)
+_XP_MODEL_PH = etree.XPath('.//t:model/t:pw/t:ph', namespaces=_NSMAP)
+
+
+def _first(xpath, element):
+    """Return the first element matched by a compiled XPath, or None."""
+    matches = xpath(element)
+    return matches[0] if matches else None
+
+
+def _is_suffix_pos(element):
+    """Whether a <c> or <s> element is part of a suffix's mor-post POS."""
+    for tag in _SUFFIX_POS_ANCESTORS:
+        element = element.getparent()
+        if element is None or element.tag != tag:
+            return False
+    return True
+
+
 cDigraphs = {
     'ɪ': ['a', 'ɑ', 'o', 'e', 'ɔ'],
     'ʊ': ['a', 'ɑ', 'o', 'ɔ'], 
@@ -39,6 +85,10 @@ cDigraphs = {
     '˞': ['ɜ'],
 }
 
+# (previous phone, phone) pairs from cDigraphs that merge into one segment
+cMergePairs = frozenset((last_phone, this_phone) for this_phone, last_phones in cDigraphs.items()
+                        for last_phone in last_phones)
+
 cReplacement = {
     'tʃ': 'ʧ',
     'əl': 'l̩',
@@ -99,11 +149,18 @@ cArpaToIPA = {
     'Q': 'ʔ'
 }
 
-cVowels = {'ɔ', 'ɑ', 'i', 'u', 'ɛ', 'ɪ', 'ʊ', 'ʌ', 'ə', 'æ', 'ə', 'e', 'eɪ', 
-           'aɪ', 'oʊ', 'o', 'aʊ', 'ɔɪ', 'ɚ'}
+# Arpabet to IPA with every stress variant (P, P0, P1, P2) as its own key,
+# so phones can be looked up without stripping the stress digit
+cArpaToIPAFull = {arpa + stress: ipa for arpa, ipa in cArpaToIPA.items()
+                  if not arpa[-1].isdigit()
+                  for stress in ('', '0', '1', '2')}
+cArpaToIPAFull['AH0'] = cArpaToIPA['AH0']
+
+cVowels = frozenset({'ɔ', 'ɑ', 'i', 'u', 'ɛ', 'ɪ', 'ʊ', 'ʌ', 'ə', 'æ', 'ə', 'e', 'eɪ', 
+                     'aɪ', 'oʊ', 'o', 'aʊ', 'ɔɪ', 'ɚ'})
 
-cConsonants = {'P', 'B', 'T', 'D', 'K', 'G', 'CH', 'JH', 'F', 'V', 'TH', 'DH', 
-               'S', 'Z', 'SH', 'ZH', 'HH', 'M', 'N', 'NG', 'L', 'R',' Q'}
+cConsonants = frozenset({'P', 'B', 'T', 'D', 'K', 'G', 'CH', 'JH', 'F', 'V', 'TH', 'DH', 
+                         'S', 'Z', 'SH', 'ZH', 'HH', 'M', 'N', 'NG', 'L', 'R', 'Q'})
 
 
 # Download the CMU Dictionary
@@ -115,6 +172,29 @@ except LookupError:
     cmu = nltk.corpus.cmudict.dict()
 
 
+def _arpa_to_ipa(transcription):
+    """Turn Arpabet transcription into IPA transcription.
+    """
+    ipa_transcription = []
+    last = len(transcription) - 1
+    for i, p in enumerate(transcription):
+        this_phone = cArpaToIPAFull[p]
+        
+        # test the rare 'l' first so most phones skip the lookahead
+        if (this_phone == 'l' and (i == last or transcription[i+1] in cConsonants) 
+            and ipa_transcription and ipa_transcription[-1] == 'ə'):
+            ipa_transcription[-1] = ipa_transcription[-1] + this_phone
+        else:
+            ipa_transcription.append(this_phone)
+            
+    return ipa_transcription
+
+
+# IPA transcription of the first pronunciation of every CMU entry, 
+# converted once so that parental speech only needs a dict lookup
+cmu_ipa = {word: tuple(_arpa_to_ipa(prons[0])) for word, prons in cmu.items()}
+
+
 class ProvidenceCorpusReader(CHILDESCorpusReader):
     
     def __init__(self, root, fileids, lazy=True):
@@ -135,18 +215,37 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
         and linguistic annotations from the corpus, 
             encoded as namedtuples
             ``namedtuple(fileid, age,orthography, stem, transcription, pos, media_times)``.
+            If ``relation`` is True, the words are grouped into one list per utterance.
         :rtype: list(namedtuple(str, str, str, str, namedtuple, str, tuple))
         """
         if not self._lazy:
-            return [self._get_words(fileid, speaker, False, stem, relation,
-                pos, strip_space, replace, utt_times =True, transcription=True, word_info = True) 
+            return [self._get_words_info(fileid, speaker, stem, relation,
+                pos, strip_space, replace)
                                     for fileid in self.abspaths(fileids)]
 
-        get_words = lambda fileid: self._get_words(fileid, speaker, False, stem, relation,
-            pos, strip_space, replace, utt_times=True, transcription=True, word_info = True)
+        get_words = lambda fileid: self._get_words_info(fileid, speaker, 
+            stem, relation, pos, strip_space, replace)
 #         print(word_info)
         return LazyConcatenation(LazyMap(get_words, self.abspaths(fileids)))
      
+     
+    def words_info_columns(self, fileids=None, speaker='ALL', strip_space=True):
+        """
+        :return: the same information as ``words_info`` with its default 
+            annotations, but stored by column rather than by word, as a single 
+            namedtuple of lists
+            ``namedtuple(fileid, age, orthography, stem, transcription, pos, media_times)``,
+            where each field holds one entry per word.
+            This avoids building a namedtuple for every word.
+        :rtype: namedtuple(list, list, list, list, list, list, list)
+        """
+        columns = self._new_columns()
+        for fileid in self.abspaths(fileids):
+            file_columns = self._get_words_columns(fileid, speaker, strip_space)
+            for column, file_column in zip(columns, file_columns):
+                column.extend(file_column)
+        return columns
+     
       
     def words_times(self, fileids=None, speaker='ALL', sent=True, stem=False,
             relation=False, strip_space=True, replace=False, pos=False):
@@ -197,21 +296,23 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
         # Modified from the _get_words() function from CHILDESCorpusReader
         # with added functionalities
         
-        print('Processing file ', fileid)
-        filename = str(fileid).rsplit('/', maxsplit=1)[-1]
-        age_month = self.age(fileid, month=True)[0]
-        
         # processing each xml doc
         results = [] 
         
+        # in word_info mode, the fields of each word are appended to one
+        # list per field, and turned into namedtuples once the file has been
+        # read and the fileid and age columns are filled in. bounds holds
+        # where each selected utterance ends.
+        columns = self._new_columns() if word_info else None
+        bounds = [0]
+        ages = {}
+        
         # ensure we have a list of speakers
         if isinstance(speaker, string_types) and speaker != 'ALL':  
             speaker = [speaker]
             
-        xmldoc = ElementTree.parse(fileid).getroot()
- 
         # iterates through each sentence <u></u>
-        for xmlsent in xmldoc.findall('.//{%s}u' % NS):
+        for xmlsent in self._iter_utterances(fileid, ages):
             
             sents = []
             # get the media times for each sentence
@@ -225,13 +326,15 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
                 # iterates through all word elements <w></w> in an utterance
                 
                 if speaker == ['CHI']:
-                    xmlwords = xmlsent.findall('.//{%s}pg' % NS)
+                    xmlwords = _XP_PG(xmlsent)
                 else:
-                    xmlwords = xmlsent.findall('.//{%s}w' % NS)
+                    xmlwords = _XP_W(xmlsent)
 
                 for xmlword in xmlwords:
                     
                     suffixStem = None
+                    word_stem = None
+                    word_transcription = None
                     
                     if replace:
                         xmlword = self._get_replaced_words(xmlsent)
@@ -247,7 +350,7 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
                     orthography = word
                     # stem
                     if relation or stem:
-                        stem = self._get_word_stem(xmlword, word).lower()
+                        word_stem = self._get_word_stem(xmlword, word).lower()
                         word = word
                             
                     # pos
@@ -262,38 +365,189 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
                     # get transcription since parental speech
                     # aren't transcribed
                     if transcription:
-                        transcription = self._get_transcription(xmlword, orthography, speaker, ipa)
-                        word = (orthography, transcription)
+                        word_transcription = self._get_transcription(xmlword, orthography, speaker, ipa)
+                        word = (orthography, word_transcription)
                     
                     if utt_times:
                         word = (orthography, media_times)
                     
                     
                     if word_info:
-                        # Discard word if there's no transcription. Not ideal, so
-                        # future development should let the user decide what to do when the
-                        # transcription isn't found.
-                        try:
-                            word = self.word_info(filename, age_month, orthography, stem, transcription, 
-                                                  pos_tag, media_times)
-                        except IndexError:
-                            continue
+                        columns.orthography.append(orthography)
+                        columns.stem.append(word_stem)
+                        columns.transcription.append(word_transcription)
+                        columns.pos.append(pos_tag)
+                        columns.media_times.append(media_times)
+                        continue
                       
                     sents.append(word)
                     
-                if sent or relation:
+                if word_info:
+                    bounds.append(len(columns.orthography))
+                elif sent or relation:
                     results.append(sents)
                 else:
                     results.extend(sents)
+        
+        if word_info:
+            self._fill_file_columns(columns, fileid, ages)
+            results = list(map(self.word_info, *columns))
+            if sent or relation:
+                results = [results[start:end] for start, end in zip(bounds, bounds[1:])]
                     
         return results
     
     
+    def _get_words_info(self, fileid, speaker, stem, relation, pos,
+                        strip_space, replace):
+        """
+        Get the word_info namedtuples of a file, using the version of 
+        _get_words specialized for the speaker when only the default 
+        annotations (stem, pos, media times and IPA transcription) are 
+        requested.
+        """
+        if relation or replace or not stem or not pos:
+            return self._get_words(fileid, speaker, False, stem, relation,
+                pos, strip_space, replace, utt_times=True, transcription=True, word_info=True)
+        
+        # the specialized versions return columns, so zip them back into 
+        # one namedtuple per word
+        return list(map(self.word_info, *self._get_words_columns(fileid, speaker, strip_space)))
+    
+    
+    def _get_words_columns(self, fileid, speaker, strip_space):
+        """
+        Get the word_info columns of a file from the version of _get_words 
+        specialized for the speaker.
+        """
+        if isinstance(speaker, string_types) and speaker != 'ALL':  
+            speaker = [speaker]
+        
+        if speaker == ['CHI']:
+            return self._get_child_words_info(fileid, strip_space)
+        return self._get_parent_words_info(fileid, speaker, strip_space)
+    
+    
+    def _get_child_words_info(self, fileid, strip_space):
+        """
+        _get_words in word_info mode for the child's speech, with the 
+        annotation flags folded away. The transcription is the model and
+        actual pronunciation from the corpus.
+        """
+        columns = self._new_columns()
+        ages = {}
+        
+        for xmlsent in self._iter_utterances(fileid, ages):
+            if xmlsent.get('who') != 'CHI':
+                continue
+            
+            media_times = self._get_media_times(xmlsent)
+            
+            for xmlword in _XP_PG(xmlsent):
+                word = self._get_word_text(xmlword, strip_space).lower()
+                
+                # skip entries not found in the CMU dictionary
+                if word not in cmu:
+                    continue
+                
+                columns.orthography.append(word)
+                columns.stem.append(self._get_word_stem(xmlword, word).lower())
+                columns.transcription.append(self.child_transcription(
+                    self._get_child_phones(xmlword, False), self._get_child_phones(xmlword, True)))
+                columns.pos.append(self._get_word_pos(xmlword))
+                columns.media_times.append(media_times)
+        
+        self._fill_file_columns(columns, fileid, ages)
+        return columns
+    
+    
+    def _get_parent_words_info(self, fileid, speaker, strip_space):
+        """
+        _get_words in word_info mode for speakers other than the child, with
+        the annotation flags folded away. The transcription is the IPA 
+        conversion of the CMU dictionary pronunciation.
+        """
+        columns = self._new_columns()
+        ages = {}
+        
+        for xmlsent in self._iter_utterances(fileid, ages):
+            if speaker != 'ALL' and xmlsent.get('who') not in speaker:
+                continue
+            
+            media_times = self._get_media_times(xmlsent)
+            
+            for xmlword in _XP_W(xmlsent):
+                word = self._get_word_text(xmlword, strip_space).lower()
+                
+                # skip entries not found in the CMU dictionary
+                if word not in cmu:
+                    continue
+                
+                columns.orthography.append(word)
+                columns.stem.append(self._get_word_stem(xmlword, word).lower())
+                columns.transcription.append(cmu_ipa.get(word.strip(), ()))
+                columns.pos.append(self._get_word_pos(xmlword))
+                columns.media_times.append(media_times)
+        
+        self._fill_file_columns(columns, fileid, ages)
+        return columns
+    
+    
+    def _new_columns(self):
+        """
+        An empty word_info namedtuple with a list for every field.
+        """
+        return self.word_info([], [], [], [], [], [], [])
+    
+    
+    def _iter_utterances(self, fileid, ages):
+        """
+        Stream the <u> elements of a file, freeing each utterance and the 
+        siblings before it once the caller is done with it, so that only one 
+        utterance is held in memory at a time. The age of every participant,
+        which the header lists before the first utterance, is stored in ages 
+        by participant id.
+        """
+        logger.debug('Processing file %s', fileid)
+        
+        for _, xmlsent in etree.iterparse(fileid, events=('end',), 
+                                          tag=(_TAG_PARTICIPANT, _TAG_U)):
+            if xmlsent.tag == _TAG_PARTICIPANT:
+                ages[xmlsent.get('id')] = xmlsent.get('age')
+                continue
+            yield xmlsent
+            xmlsent.clear()
+            while xmlsent.getprevious() is not None:
+                del xmlsent.getparent()[0]
+    
+    
+    def _fill_file_columns(self, columns, fileid, ages):
+        """
+        Fill in the fileid and age columns for the words of a file, once the
+        other columns have been read from it.
+        """
+        n_words = len(columns.orthography) - len(columns.fileid)
+        columns.fileid.extend([str(fileid).rsplit('/', maxsplit=1)[-1]] * n_words)
+        columns.age.extend([self._child_age(ages)] * n_words)
+    
+    
+    def _child_age(self, ages):
+        """
+        The child's age in months, from the participant ages collected by 
+        _iter_utterances, or None if it is missing. Equivalent to 
+        ``self.age(fileid, month=True)[0]`` without parsing the file again.
+        """
+        try:
+            return self.convert_age(ages.get('CHI'))
+        except (TypeError, AttributeError, ValueError):
+            return None
+    
+    
     def _get_media_times(self, xmlsent):
         """
         Finds the location of the sentence within the audio file.
         """
-        sent_times = xmlsent.find('.//{%s}media' % (NS))
+        sent_times = _first(_XP_MEDIA, xmlsent)
         try:
             media_times = (float(sent_times.attrib['start']), float(sent_times.attrib['end']))
         except AttributeError:
@@ -303,12 +557,10 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
     
     def _get_replaced_word(self, xmlsent):
 
-        if xmlsent.find('.//{%s}w/{%s}replacement'
-                                            % (NS, NS)):
-            xmlword = xmlsent.find('.//{%s}w/{%s}replacement/{%s}w'
-                                   % (NS, NS, NS))
-        elif xmlsent.find('.//{%s}w/{%s}wk' % (NS, NS)):
-            xmlword = xmlsent.find('.//{%s}w/{%s}wk' % (NS, NS))
+        if _XP_REPLACEMENT(xmlsent):
+            xmlword = _first(_XP_REPLACEMENT_W, xmlsent)
+        elif _XP_WK(xmlsent):
+            xmlword = _first(_XP_WK, xmlsent)
         
         return xmlword
     
@@ -318,8 +570,8 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
         Get the text of the word
         """
         # If the speaker is a 'CHI', get the child element <w>
-        if xmlword.tag == '{%s}pg' % NS:
-            xmlword = xmlword.find('.//{%s}w' % NS)
+        if xmlword.tag == _TAG_PG:
+            xmlword = _first(_XP_W, xmlword)
         if xmlword.text:
             word = xmlword.text
         else:
@@ -335,23 +587,21 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
     def _get_word_stem(self, xmlword, word):
                         
         try:
-            xmlstem = xmlword.find('.//{%s}stem' % NS)
+            xmlstem = _first(_XP_STEM, xmlword)
             word = xmlstem.text
         except AttributeError:
             pass
         
         # if there is an inflection
         try:
-            xmlinfl = xmlword.find('.//{%s}mor/{%s}mw/{%s}mk'
-                                   % (NS, NS, NS))
+            xmlinfl = _first(_XP_INFL, xmlword)
             word += '-' + xmlinfl.text
         except:
             pass
         
         # if there is a suffix
         try:
-            xmlsuffix = xmlword.find('.//{%s}mor/{%s}mor-post/{%s}mw/{%s}stem'
-                                     % (NS, NS, NS, NS))
+            xmlsuffix = _first(_XP_SUFFIX_STEM, xmlword)
             suffixStem = xmlsuffix.text
         except AttributeError:
             suffixStem = ""
@@ -364,10 +614,21 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
     
     def _get_word_pos(self, xmlword):
         suffixTag = None
+        
+        # collect the <c> (category) and <s> (subcategory) elements in a 
+        # single pass, setting aside those that belong to the suffix
+        xmlpos, xmlpos2, xmlsuffixpos, xmlsuffixpos2 = [], [], [], []
+        for xmlc in xmlword.iter(_TAG_C, _TAG_S):
+            if xmlc.tag == _TAG_C:
+                xmlpos.append(xmlc)
+                if _is_suffix_pos(xmlc):
+                    xmlsuffixpos.append(xmlc)
+            else:
+                xmlpos2.append(xmlc)
+                if _is_suffix_pos(xmlc):
+                    xmlsuffixpos2.append(xmlc)
 
         try:
-            xmlpos = xmlword.findall(".//{%s}c" % NS)
-            xmlpos2 = xmlword.findall(".//{%s}s" % NS)
             if xmlpos2 != []:
                 tag = xmlpos[0].text + ":" + xmlpos2[0].text
             else:
@@ -375,10 +636,6 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
         except (AttributeError, IndexError):
             tag = ""
         try:
-            xmlsuffixpos = xmlword.findall('.//{%s}mor/{%s}mor-post/{%s}mw/{%s}pos/{%s}c'
-                                           % (NS, NS, NS, NS, NS))
-            xmlsuffixpos2 = xmlword.findall('.//{%s}mor/{%s}mor-post/{%s}mw/{%s}pos/{%s}s'
-                                            % (NS, NS, NS, NS, NS))
             if xmlsuffixpos2:
                 suffixTag = xmlsuffixpos[0].text + ":" + xmlsuffixpos2[0].text
             else:
@@ -392,8 +649,7 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
         return tag
     
     def _get_word_relation(self, xmlword, word, suffixStem):
-        for xmlstem_rel in xmlword.findall('.//{%s}mor/{%s}gra'
-                                                   % (NS, NS)):
+        for xmlstem_rel in _XP_GRA(xmlword):
             if not xmlstem_rel.get('type') == 'grt':
                 word = (word[0], word[1],
                         xmlstem_rel.get('index')
@@ -407,8 +663,7 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
                         + "|" + xmlstem_rel.get('relation'))
         
         try:
-            for xmlpost_rel in xmlword.findall('.//{%s}mor/{%s}mor-post/{%s}gra'
-                                                       % (NS, NS, NS)):
+            for xmlpost_rel in _XP_SUFFIX_GRA(xmlword):
                 if not xmlpost_rel.get('type') == 'grt':
                     suffixStem = (suffixStem[0],
                                   suffixStem[1],
@@ -436,33 +691,15 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
             model_phones = self._get_child_phones(xmlword, False)
             actual_phones = self._get_child_phones(xmlword, True)
             transcription = self.child_transcription(model_phones, actual_phones)
+        elif ipa:
+            transcription = cmu_ipa.get(orthography.strip(), ())
         else:
             try:
                 transcription = cmu[orthography.strip()][0]
             except KeyError:
                 transcription = ''
-            
-            if ipa:
-                transcription = self._arpa_to_ipa(transcription)
         
         return transcription
-
-    def _arpa_to_ipa(self, transcription):
-        """Turn Arpabet transcription into IPA transcription.
-        """
-        ipa_transcription = []
-        for i, p in enumerate(transcription):
-            if p != 'AH0':
-                this_phone = cArpaToIPA[p.strip('012')]
-            else:
-                this_phone = cArpaToIPA[p]
-            
-            if (i == len(transcription) - 1 or transcription[i+1] in cConsonants) and this_phone == 'l' and ipa_transcription[-1] == 'ə':
-                ipa_transcription[-1] = ipa_transcription[-1] + this_phone
-            else:
-                ipa_transcription.append(this_phone)
-                
-        return ipa_transcription
     
     def _get_child_phones(self, xmlword, actual = True):
         """Given a word uttered by a child, get the transcription of the model production
@@ -472,28 +709,32 @@ class ProvidenceCorpusReader(CHILDESCorpusReader):
         last_phone = ''
         
         if actual:
-            xmlphones = xmlword.findall('.//{%s}actual/{%s}pw/{%s}ph' % (NS, NS, NS))
+            xmlphones = _XP_ACTUAL_PH(xmlword)
         else: 
-            xmlphones = xmlword.findall('.//{%s}model/{%s}pw/{%s}ph' % (NS, NS, NS))
+            xmlphones = _XP_MODEL_PH(xmlword)
+        
+        # read the phone texts once rather than going back to the elements
+        # for the lookahead
+        texts = [xmlphone.text for xmlphone in xmlphones]
+        last = len(texts) - 1
                     
-        for i, xmlphone in enumerate(xmlphones):
-            this_phone = xmlphone.text
+        for i, this_phone in enumerate(texts):
             if this_phone == 'ː':
                 continue
             
             if this_phone == '(':
                 break
             
-            if (this_phone in cDigraphs.keys() 
-                and last_phone in cDigraphs[this_phone]):
+            if (last_phone, this_phone) in cMergePairs:
                 phones[-1] = phones[-1] + this_phone
-            elif (i == len(xmlphones) - 1 or xmlphones[i+1].text in cVowels) and this_phone == 'l' and last_phone == 'ə':
+            elif this_phone == 'l' and last_phone == 'ə' and (i == last or texts[i+1] in cVowels):
                 phones[-1] = phones[-1] + this_phone
             else:
                 phones.append(this_phone)
             
-            if phones[-1] in cReplacement.keys():
-                phones[-1] = cReplacement[phones[-1]]
+            replacement = cReplacement.get(phones[-1])
+            if replacement:
+                phones[-1] = replacement
                 
             last_phone = this_phone
             
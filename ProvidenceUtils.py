@@ -1,24 +1,30 @@
 import os
 
+def _listNames(path, dirs):
+    """Names of the non-hidden directories (or files, if dirs is False)
+    in path, read with a single os.scandir pass.
+    """
+    with os.scandir(path) as entries:
+        return [entry.name for entry in entries
+                if not entry.name.startswith('.') and entry.is_dir() == dirs]
+
 def getFileIds(prov_path, by_child=False):
     """Given the root directory of the XML version of the Providence Corpus,
     returns all the fileids of the corpus to be used by ProvidenceCorpusReader.
     """
-    subdirs = [subdir for subdir in os.listdir(prov_path)
-               if not subdir.startswith('.')]
+    subdirs = _listNames(prov_path, dirs=True)
     
     if by_child:
         fileids = {}
         for subdir in subdirs:
-            fileids[subdir] = [os.path.join(subdir, filename) 
-                            for filename in os.listdir(os.path.join(prov_path, subdir))]
-            fileids[subdir].sort()
+            fileids[subdir] = sorted(os.path.join(subdir, filename) 
+                                     for filename in _listNames(os.path.join(prov_path, subdir), dirs=False))
             
     else:
         fileids = []
         for subdir in subdirs:
             fileids.extend([os.path.join(subdir, filename) 
-                            for filename in os.listdir(os.path.join(prov_path, subdir))])
+                            for filename in _listNames(os.path.join(prov_path, subdir), dirs=False)])
             
         fileids.sort()
     return fileids
\ No newline at end of file